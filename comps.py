@@ -0,0 +1,106 @@
+"""
+Comparable listings ("comps") search for the Price Predictor.
+
+Listings from X_dataframe.joblib are encoded over bedrooms, bathrooms, built-up area,
+furnishing and luxury category, and indexed with one KD-tree per sector. A query is
+answered from the tree of its own sector; when the sector has fewer listings than
+asked for (or is unknown), the rest are the nearest listings from other sectors.
+"""
+import numpy as np
+import pandas as pd
+
+# Ordered categories share the ordinal codes used in the notebooks
+FURNISHING_ORDER = {'unfurnished': 0, 'semifurnished': 1, 'furnished': 2}
+LUXURY_ORDER = {'low': 0, 'medium': 1, 'high': 2}
+
+DISPLAY_COLUMNS = ['society', 'sector', 'property_type', 'bedRoom', 'bathroom', 'built_up_area',
+                   'furnishing_type', 'luxury_category', 'price']
+
+
+def encode(df):
+    """Encodes listings (or queries) into the numeric matrix the index is built over."""
+    return np.column_stack([
+        df['bedRoom'].astype(float),
+        df['bathroom'].astype(float),
+        # Areas are heavily skewed, so compare them on a log scale
+        np.log1p(df['built_up_area'].astype(float)),
+        df['furnishing_type'].map(FURNISHING_ORDER).fillna(0).astype(float),
+        df['luxury_category'].map(LUXURY_ORDER).fillna(0).astype(float),
+    ])
+
+
+class CompsIndex:
+    """Nearest-neighbour index over the encoded listing matrix, partitioned by sector."""
+
+    def __init__(self, listings_df):
+        from sklearn.neighbors import KDTree
+
+        self.listings = listings_df.reset_index(drop=True)
+        matrix = encode(self.listings)
+        self.mean = matrix.mean(axis=0)
+        self.std = matrix.std(axis=0)
+        self.std[self.std == 0] = 1.0
+        scaled = (matrix - self.mean) / self.std
+
+        self.city_tree = KDTree(scaled)
+        self.sector_trees = {}  # sector -> (KDTree, positions of its listings in self.listings)
+        for sector, positions in self.listings.groupby('sector').indices.items():
+            self.sector_trees[sector] = (KDTree(scaled[positions]), positions)
+
+    def query(self, query_df, k=5):
+        """
+        Finds the k most similar listings for every row of `query_df`.
+
+        Args:
+            query_df (pandas.DataFrame): Rows with 'sector', 'bedRoom', 'bathroom',
+                'built_up_area', 'furnishing_type' and 'luxury_category'.
+            k (int): Number of comparable listings per query.
+
+        Returns:
+            pandas.DataFrame: The listing columns plus 'query' (the position of the query
+            row in `query_df`) and 'distance', ordered by query, then listings from the
+            query's own sector before any from other sectors, then closest first.
+        """
+        query_df = query_df.reset_index(drop=True)
+        scaled = (encode(query_df) - self.mean) / self.std
+        k = min(k, len(self.listings))
+        neighbours = np.empty((len(query_df), k), dtype=int)
+        distances = np.empty((len(query_df), k))
+
+        # Queries are batched per sector so each tree is searched once
+        for sector, rows in query_df.groupby('sector').indices.items():
+            tree, positions = self.sector_trees.get(sector, (None, np.empty(0, dtype=int)))
+            in_sector = min(k, len(positions))
+            if in_sector:
+                distances[rows, :in_sector], sector_neighbours = tree.query(scaled[rows], k=in_sector)
+                neighbours[rows, :in_sector] = positions[sector_neighbours]
+            if in_sector < k:
+                # Top up from the city-wide tree, skipping this sector's listings. At most
+                # `in_sector` of the k nearest are in the sector, so k is enough to search.
+                city_distances, city_neighbours = self.city_tree.query(scaled[rows], k=k)
+                outside = np.argsort(np.isin(city_neighbours, positions), axis=1, kind='stable')[:, :k - in_sector]
+                distances[rows, in_sector:] = np.take_along_axis(city_distances, outside, axis=1)
+                neighbours[rows, in_sector:] = np.take_along_axis(city_neighbours, outside, axis=1)
+
+        comps_df = self.listings.iloc[neighbours.ravel()].copy()
+        comps_df.insert(0, 'query', np.repeat(np.arange(len(query_df)), k))
+        comps_df['distance'] = distances.ravel()
+        return comps_df
+
+
+def build_comps_index(listings_path='data/X_dataframe.joblib',
+                      properties_path='data/gurgaon_properties_missing_value_imputation.csv'):
+    """
+    Builds the comps index from the model's feature frame.
+
+    X_dataframe.joblib has no prices or society names, so they are taken from the imputed
+    properties CSV, whose rows line up with it one to one.
+    """
+    import joblib
+
+    listings_df = joblib.load(listings_path)
+    properties_df = pd.read_csv(properties_path, usecols=['society', 'price'])
+    if len(properties_df) != len(listings_df):
+        raise ValueError(f"'{listings_path}' and '{properties_path}' do not have the same number of rows.")
+    listings_df = listings_df.assign(society=properties_df['society'].values, price=properties_df['price'].values)
+    return CompsIndex(listings_df)
@@ -0,0 +1,40 @@
+"""
+Heavy operations that the pages hand to the compute pool (see compute_pool.py).
+
+Each function runs in a worker process, so it imports what it needs itself and
+returns plain picklable results rather than Streamlit or matplotlib objects.
+"""
+from functools import lru_cache
+
+import joblib
+
+
+@lru_cache(maxsize=None)
+def _load_model(model_path):
+    """Loads a model once per worker process."""
+    return joblib.load(model_path)
+
+
+def predict_log_price(model_path, input_df):
+    """Predicts log prices for every row of `input_df` with the model stored at `model_path`."""
+    return _load_model(model_path).predict(input_df)
+
+
+def render_wordcloud(feature_text):
+    """Renders a word cloud of `feature_text` and returns it as an RGB image array."""
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(width=800, height=400,
+                          background_color='white',
+                          stopwords=set(['s']),
+                          min_font_size=10).generate(feature_text)
+    return wordcloud.to_array()
+
+
+def build_distplot(hist_data, group_labels, title):
+    """Builds a KDE distribution plot and returns it as a plotly figure dict."""
+    import plotly.figure_factory as ff
+
+    fig_dist = ff.create_distplot(hist_data, group_labels, show_hist=False, show_rug=False)
+    fig_dist.update_layout(title_text=title)
+    return fig_dist.to_dict()
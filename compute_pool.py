@@ -0,0 +1,178 @@
+"""
+Process pool for heavy page operations.
+
+Streamlit runs every session's script on a thread of the same process, so a CPU-heavy
+step (word cloud rendering, KDE plots, large predictions) holds the GIL and slows down
+every other session. Jobs sent through `run()` execute in a small pool of worker
+processes instead.
+
+- Concurrency is capped at GURGAON_COMPUTE_WORKERS processes (0 runs jobs inline).
+- Identical jobs that are already in flight are shared rather than submitted twice.
+- Callers stop waiting after GURGAON_COMPUTE_TIMEOUT seconds and get a TimeoutError.
+  Once every caller sharing a job has given up, a queued job is cancelled and a
+  running one is killed: its pool is terminated and replaced with a fresh one, and
+  jobs that were caught on the old pool are run again on the new one.
+
+Job functions must be importable module-level functions (see compute_jobs.py) and
+their arguments must be picklable.
+"""
+import hashlib
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+import types
+import weakref
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+MAX_WORKERS = int(os.environ.get('GURGAON_COMPUTE_WORKERS', min(2, os.cpu_count() or 1)))
+JOB_TIMEOUT = float(os.environ.get('GURGAON_COMPUTE_TIMEOUT', 60))
+
+# Re-entrant because cancelling a future runs its done callbacks, which take the lock again
+_lock = threading.RLock()
+_executor = None
+_in_flight = {}  # job key -> (Future, the executor it was submitted to)
+_waiters = {}  # Future -> number of run() calls waiting on it
+_recycled = weakref.WeakSet()  # executors terminated to kill an abandoned job
+
+
+def run(fn, *args, timeout=JOB_TIMEOUT):
+    """
+    Runs `fn(*args)` on the worker pool and waits for the result.
+
+    Raises:
+        TimeoutError: If the job does not finish within `timeout` seconds. If no other
+            caller is waiting for the same job, it is cancelled or, if it has already
+            started, killed along with the rest of its pool.
+        RuntimeError: If the job was cancelled or the pool broke before it finished
+            (BrokenProcessPool is a RuntimeError too).
+    """
+    if MAX_WORKERS == 0:
+        return fn(*args)
+
+    deadline = time.monotonic() + timeout
+    while True:
+        future, executor = _acquire(fn, args)
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            raise TimeoutError(f"'{fn.__name__}' did not finish within {timeout:g} seconds.") from None
+        except (CancelledError, BrokenProcessPool) as e:
+            if executor in _recycled:
+                # The pool was killed over someone else's abandoned job; this one is still wanted
+                continue
+            if isinstance(e, CancelledError):
+                raise RuntimeError(f"'{fn.__name__}' was cancelled before it finished.") from None
+            # A worker died (e.g. killed for using too much memory); start a fresh pool next time
+            _reset_executor(executor)
+            raise
+        finally:
+            _release(future, executor)
+
+
+def _acquire(fn, args):
+    """
+    Submits `fn(*args)`, or joins an identical in-flight job, and registers the caller as waiting.
+
+    Returns:
+        tuple: (the job's Future, the executor running it)
+    """
+    key = _job_key(fn, args)
+    with _lock:
+        if key in _in_flight:
+            future, executor = _in_flight[key]
+        else:
+            executor = _get_executor()
+            # Workers are started on demand inside submit()
+            with _clean_main():
+                future = executor.submit(fn, *args)
+            _in_flight[key] = (future, executor)
+            future.add_done_callback(lambda done: _forget(key, done))
+        _waiters[future] = _waiters.get(future, 0) + 1
+    return future, executor
+
+
+def _release(future, executor):
+    """Unregisters a waiting caller, and cancels or kills the job if nobody else wants it."""
+    with _lock:
+        remaining = _waiters.pop(future, 1) - 1
+        if remaining:
+            _waiters[future] = remaining
+        elif not future.done() and not future.cancel():
+            # Already running, and a worker cannot be stopped on its own
+            _recycle_executor(executor)
+
+
+def _job_key(fn, args):
+    payload = pickle.dumps((fn.__module__, fn.__qualname__, args), protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha1(payload).hexdigest()
+
+
+def _forget(key, future):
+    with _lock:
+        if key in _in_flight and _in_flight[key][0] is future:
+            del _in_flight[key]
+
+
+def _get_executor():
+    # Called with _lock held
+    global _executor
+    if _executor is None:
+        # 'spawn' avoids forking the multi-threaded Streamlit server process
+        _executor = ProcessPoolExecutor(
+            max_workers=MAX_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _executor
+
+
+def _recycle_executor(executor):
+    """Terminates the worker processes of `executor`, if it is still current, and replaces it."""
+    with _lock:
+        if executor is not _executor:
+            return
+        _recycled.add(executor)
+        # ProcessPoolExecutor has no public way to stop a running job
+        for process in list(executor._processes.values()):
+            process.terminate()
+        _reset_executor(executor)
+
+
+@contextmanager
+def _clean_main():
+    """
+    Hides the running script from worker processes started inside the block.
+
+    'spawn' re-imports the parent's __main__ module in every new worker. Under Streamlit
+    that is whichever page first submitted a job, so each worker would run the page
+    again. With an empty __main__ the workers only import what a job needs.
+    """
+    main = sys.modules.get('__main__')
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
+
+
+def _reset_executor(executor):
+    """
+    Shuts down a broken `executor` so the next job starts a fresh pool.
+
+    Every caller whose job was on the broken pool ends up here, so it does nothing once
+    `executor` has already been replaced; the replacement may be busy with healthy jobs.
+    """
+    global _executor
+    with _lock:
+        if executor is not _executor:
+            return
+        _executor = None
+        for key, (future, owner) in list(_in_flight.items()):
+            if owner is executor:
+                del _in_flight[key]
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,44 @@
+import pandas as pd
+import streamlit as st
+
+import timing
+
+# This page is deliberately kept out of the 'pages' folder so it does not show up
+# in the app's sidebar. Run it on its own with: streamlit run diagnostics.py
+
+# --- Page Configuration ---
+st.set_page_config(
+    page_title="Timing Diagnostics",
+    page_icon="⏱️",
+    layout="wide"
+)
+
+st.title("⏱️ Timing Diagnostics")
+st.markdown(f"""
+Shows the slowest instrumented spans recorded by the dashboard.
+Start the app (or a batch script) with `GURGAON_TIMING=1` to collect timings; the metrics files in `{timing.METRICS_DIR}/` of running processes and of each script's last finished run are merged here.
+""")
+
+spans = timing.read_metrics()
+
+if spans:
+    rows = []
+    for name, hist in spans.items():
+        if hist['count'] == 0:
+            continue
+        rows.append({
+            'Span': name,
+            'Calls': hist['count'],
+            'Total (s)': hist['sum'],
+            'Mean (ms)': hist['sum'] / hist['count'] * 1000,
+            'p50 ≤ (ms)': timing.quantile(hist, 0.5) * 1000,
+            'p95 ≤ (ms)': timing.quantile(hist, 0.95) * 1000,
+        })
+    spans_df = pd.DataFrame(rows).sort_values('Mean (ms)', ascending=False)
+
+    top_n = st.slider("Number of spans to show", 5, 50, 15)
+    st.dataframe(spans_df.head(top_n), hide_index=True, use_container_width=True)
+    st.bar_chart(spans_df.head(top_n), x='Span', y='Total (s)')
+    st.caption("Percentiles are bucket upper bounds from the recorded histograms.")
+else:
+    st.warning("No timing data found yet. Enable timing and use the app for a while, then refresh this page.")
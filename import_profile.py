@@ -0,0 +1,104 @@
+"""
+Import-time profile for the Streamlit pages.
+
+Every new session pays for a page's module-level imports before anything is drawn.
+Imports that a page defers into a specific view or action (and libraries it pulls in
+indirectly, e.g. by unpickling a model) are only paid for when that view is used.
+This script times both sets in fresh interpreters and reports the saving.
+
+Run from the project root:
+    python import_profile.py
+"""
+import ast
+import subprocess
+import sys
+
+PAGES = [
+    'Home.py',
+    'pages/1_Price_Predictor.py',
+    'pages/2_Analysis_Dashboard.py',
+    'pages/3_Recommender_System.py',
+    'pages/4_Insights_Module.py',
+]
+
+# Libraries a page loads without an import statement of its own, by unpickling its
+# model files or through a helper module that imports them on first use.
+# Work sent to the compute pool (compute_jobs.py) loads its libraries in the worker
+# processes instead, so it does not count towards any page.
+IMPLICIT_DEFERRED = {
+    'pages/1_Price_Predictor.py': ['sklearn.neighbors'],
+    'pages/4_Insights_Module.py': ['sklearn.linear_model', 'sklearn.preprocessing'],
+}
+
+REPEATS = 3
+
+
+def find_imports(path):
+    """
+    Splits the imports of a script into module-level ones and deferred ones.
+
+    Returns:
+        tuple: (eager module names, deferred module names)
+    """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    def names(node):
+        if isinstance(node, ast.Import):
+            return [alias.name for alias in node.names]
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            return [node.module]
+        return []
+
+    top_level = {id(node) for node in tree.body}
+    eager, deferred = [], []
+    for node in ast.walk(tree):
+        target = eager if id(node) in top_level else deferred
+        for name in names(node):
+            if name not in target:
+                target.append(name)
+    deferred = [name for name in deferred if name not in eager]
+    return eager, deferred
+
+
+def time_imports(modules):
+    """Returns the fastest of several fresh-interpreter timings for importing `modules`, in seconds."""
+    if not modules:
+        return 0.0
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        + "".join(f"import {name}\n" for name in modules)
+        + "print(time.perf_counter() - start)\n"
+    )
+    timings = []
+    for _ in range(REPEATS):
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        timings.append(float(result.stdout.strip()))
+    return min(timings)
+
+
+def main():
+    header = f"{'Page':<32}{'Startup (s)':>13}{'Deferred (s)':>14}{'All eager (s)':>15}{'Saved':>8}"
+    print(header)
+    print('-' * len(header))
+    for page in PAGES:
+        eager, deferred = find_imports(page)
+        deferred += [name for name in IMPLICIT_DEFERRED.get(page, []) if name not in deferred]
+        try:
+            startup = time_imports(eager)
+            all_eager = time_imports(eager + deferred) if deferred else startup
+        except RuntimeError as e:
+            print(f"{page:<32}  could not import: {e}")
+            continue
+        extra = max(all_eager - startup, 0.0)
+        saved = extra / all_eager * 100 if all_eager else 0.0
+        print(f"{page:<32}{startup:>13.3f}{extra:>14.3f}{all_eager:>15.3f}{saved:>7.1f}%")
+        if deferred:
+            print(f"{'':<4}deferred: {', '.join(deferred)}")
+
+
+if __name__ == "__main__":
+    main()
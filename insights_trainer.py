@@ -0,0 +1,279 @@
+"""
+Incremental trainer for the Insights Module's ridge model.
+
+Notebook 15 fits a StandardScaler and a Ridge model on the whole insights frame.
+Both can be recovered exactly from a few running sums over the training rows:
+the row count, the feature sums, XᵀX, Xᵀy and the target sum. This script keeps
+those sufficient statistics on disk, folds new listing batches into them in
+O(batch·d²) and re-solves the d×d ridge system in O(d³) to publish a new
+versioned model/scaler/model_columns set, which the Insights page picks up on
+its next rerun.
+
+Usage (from the project root):
+    python insights_trainer.py init                  # statistics from data/insights_df_final.pkl
+    python insights_trainer.py add new_listings.csv  # fold in new listings and publish
+"""
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ALPHA = 0.0001
+
+BASE_DF_PATH = 'data/insights_df_final.pkl'
+BASE_COLUMNS_PATH = 'data/model_columns_final.pkl'
+BASE_MODEL_PATH = 'data/ridge_model_final.pkl'
+BASE_SCALER_PATH = 'data/scaler_final.pkl'
+
+MODELS_DIR = 'data/insights_model'
+STATS_PATH = os.path.join(MODELS_DIR, 'stats.joblib')
+LATEST_PATH = os.path.join(MODELS_DIR, 'LATEST')
+
+# Same label clean-up as notebook 15, so raw listings can be folded in directly
+AGE_POSSESSION_MAP = {
+    'Relatively New': 'new',
+    'Moderately Old': 'old',
+    'New Property': 'new',
+    'Old Property': 'old',
+    'Under Construction': 'under construction'
+}
+CATEGORY_MAPS = {
+    'property_type': {'flat': 0, 'house': 1},
+    'furnishing_type': {'unfurnished': 0, 'semifurnished': 1, 'furnished': 2},
+    'luxury_category': {'low': 0, 'medium': 1, 'high': 2},
+}
+
+
+def prepare_batch(df, columns):
+    """
+    Turns listings in the insights frame format into a feature matrix and log-price target.
+
+    The agePossession dummies are built against `columns` rather than with
+    pd.get_dummies(drop_first=True), which would drop a different category
+    depending on what a batch happens to contain.
+
+    Running sums cannot be repaired once a bad row is folded in, so the whole
+    batch is rejected if anything is missing, unknown or not a finite number.
+
+    Returns:
+        tuple: (X as a float array with one column per entry of `columns`, y as a float array)
+
+    Raises:
+        ValueError: If the batch is missing a required column, has an unknown category
+            label, or has a non-finite feature or price.
+    """
+    age_columns = [column for column in columns if column.startswith('agePossession_')]
+    required = [column for column in columns if column not in age_columns] + ['price']
+    if age_columns:
+        required.append('agePossession')
+    missing = [column for column in required if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}.")
+
+    df = df.copy()
+    df['agePossession'] = df['agePossession'].replace(AGE_POSSESSION_MAP)
+    known_categories = {'agePossession': set(AGE_POSSESSION_MAP.values())}
+    for column, mapping in CATEGORY_MAPS.items():
+        df[column] = df[column].replace(mapping)
+        known_categories[column] = set(mapping.values())
+    for column, known in known_categories.items():
+        unknown = set(df.loc[~df[column].isin(known), column].astype(str))
+        if unknown:
+            raise ValueError(f"Unknown {column} values: {', '.join(sorted(unknown))}.")
+
+    X = pd.DataFrame(0.0, index=df.index, columns=columns)
+    for column in columns:
+        if column in age_columns:
+            X[column] = (df['agePossession'] == column[len('agePossession_'):]).astype(float)
+        else:
+            X[column] = pd.to_numeric(df[column], errors='coerce')
+    price = pd.to_numeric(df['price'], errors='coerce')
+
+    not_finite = [column for column in columns if not np.isfinite(X[column]).all()]
+    if not np.isfinite(price).all() or (price < 0).any():
+        not_finite.append('price')
+    if not_finite:
+        raise ValueError(f"Missing, non-numeric or non-finite values in: {', '.join(not_finite)}.")
+
+    return X.to_numpy(dtype=float), np.log1p(price.to_numpy(dtype=float))
+
+
+class SufficientStatistics:
+    """Running sums from which the scaler and ridge model are solved exactly."""
+
+    def __init__(self, columns):
+        d = len(columns)
+        self.columns = list(columns)
+        self.n = 0
+        self.sum_x = np.zeros(d)
+        self.sum_y = 0.0
+        self.xtx = np.zeros((d, d))
+        self.xty = np.zeros(d)
+
+    def to_dict(self):
+        return {'columns': self.columns, 'n': self.n, 'sum_x': self.sum_x, 'sum_y': self.sum_y,
+                'xtx': self.xtx, 'xty': self.xty}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data['columns'])
+        stats.n, stats.sum_x, stats.sum_y = data['n'], data['sum_x'], data['sum_y']
+        stats.xtx, stats.xty = data['xtx'], data['xty']
+        return stats
+
+    def update(self, X, y):
+        """Folds a batch of rows into the statistics."""
+        self.n += X.shape[0]
+        self.sum_x += X.sum(axis=0)
+        self.sum_y += y.sum()
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+
+    def solve(self, alpha=ALPHA):
+        """
+        Solves for the StandardScaler and Ridge model a full refit on every row seen so far would produce.
+
+        With mean μ and standard deviation σ per feature, the standardised data Z = (X - μ) / σ
+        is already centred, so Ridge's intercept is the target mean and its coefficients solve
+            (ZᵀZ + αI) w = Zᵀ(y - ȳ)
+        where ZᵀZ = (XᵀX - nμμᵀ) / σσᵀ and Zᵀ(y - ȳ) = (Xᵀy - nμȳ) / σ.
+        """
+        from sklearn.linear_model import Ridge
+        from sklearn.preprocessing import StandardScaler
+
+        mean_x = self.sum_x / self.n
+        mean_y = self.sum_y / self.n
+        centred_xtx = self.xtx - self.n * np.outer(mean_x, mean_x)
+        centred_xty = self.xty - self.n * mean_x * mean_y
+
+        var = np.clip(np.diag(centred_xtx) / self.n, 0.0, None)
+        # StandardScaler leaves constant features unscaled
+        scale = np.where(var > 0, np.sqrt(var), 1.0)
+
+        ztz = centred_xtx / np.outer(scale, scale)
+        zty = centred_xty / scale
+        coef = np.linalg.solve(ztz + alpha * np.eye(len(self.columns)), zty)
+
+        scaler = StandardScaler()
+        scaler.mean_, scaler.var_, scaler.scale_ = mean_x, var, scale
+        scaler.n_samples_seen_ = self.n
+        scaler.n_features_in_ = len(self.columns)
+        scaler.feature_names_in_ = np.asarray(self.columns, dtype=object)
+
+        model = Ridge(alpha=alpha)
+        model.coef_, model.intercept_ = coef, mean_y
+        # No feature names here: like the notebook's model, it is fitted on the scaler's ndarray output
+        model.n_features_in_ = len(self.columns)
+        model.solver_ = 'cholesky'
+        model.n_iter_ = None
+        return model, scaler
+
+
+# --- Versioned artifacts ---
+def latest_version():
+    """Returns the newest published model version, or None if only the notebook's files exist."""
+    try:
+        with open(LATEST_PATH) as f:
+            return int(f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def artifact_paths(version):
+    """Returns the (model, scaler, columns) file paths for a published version, or the notebook's files for None."""
+    if version is None:
+        return BASE_MODEL_PATH, BASE_SCALER_PATH, BASE_COLUMNS_PATH
+    version_dir = os.path.join(MODELS_DIR, f'v{version:04d}')
+    return (os.path.join(version_dir, 'ridge_model.pkl'),
+            os.path.join(version_dir, 'scaler.pkl'),
+            os.path.join(version_dir, 'model_columns.pkl'))
+
+
+def publish(stats):
+    """
+    Solves the model from `stats` and publishes it, with the statistics, as the next version.
+
+    Raises:
+        ValueError: If the solved model is not finite. Nothing is written in that case.
+    """
+    model, scaler = stats.solve()
+    if not (np.isfinite(model.coef_).all() and np.isfinite(model.intercept_)
+            and np.isfinite(scaler.mean_).all() and np.isfinite(scaler.scale_).all()):
+        raise ValueError("The solved model has non-finite coefficients; nothing was published.")
+    version = (latest_version() or 0) + 1
+    model_path, scaler_path, columns_path = artifact_paths(version)
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+    joblib.dump(model, model_path)
+    joblib.dump(scaler, scaler_path)
+    joblib.dump(stats.columns, columns_path)
+    # Stored as a plain dict so the file does not depend on how this script was run
+    joblib.dump(stats.to_dict(), STATS_PATH)
+
+    # Switching LATEST last means readers only ever see a complete version
+    tmp_path = f'{LATEST_PATH}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(str(version))
+    os.replace(tmp_path, LATEST_PATH)
+    return version
+
+
+def read_listings(path):
+    """Reads a batch of listings from a .csv or a pickled DataFrame."""
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    return joblib.load(path)
+
+
+def init():
+    columns = joblib.load(BASE_COLUMNS_PATH)
+    X, y = prepare_batch(joblib.load(BASE_DF_PATH), columns)
+    stats = SufficientStatistics(columns)
+    stats.update(X, y)
+
+    # Check the solved model against a full refit, as notebook 15 does it
+    from sklearn.linear_model import Ridge
+    from sklearn.preprocessing import StandardScaler
+    refit_scaler = StandardScaler().fit(X)
+    refit_model = Ridge(alpha=ALPHA).fit(refit_scaler.transform(X), y)
+    model, scaler = stats.solve()
+    print(f"Max difference from a full refit: "
+          f"coefficients {np.abs(model.coef_ - refit_model.coef_).max():.2e}, "
+          f"intercept {abs(model.intercept_ - refit_model.intercept_):.2e}, "
+          f"scaler means {np.abs(scaler.mean_ - refit_scaler.mean_).max():.2e}")
+
+    try:
+        version = publish(stats)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"Published version {version} from {stats.n} listings.")
+
+
+def add(paths):
+    try:
+        stats = SufficientStatistics.from_dict(joblib.load(STATS_PATH))
+    except FileNotFoundError:
+        sys.exit("No statistics found. Run `python insights_trainer.py init` first.")
+    for path in paths:
+        try:
+            X, y = prepare_batch(read_listings(path), stats.columns)
+        except ValueError as e:
+            # Nothing has been saved yet, so rejecting here leaves the published model untouched
+            sys.exit(f"Rejected {path}: {e} No listings were folded in.")
+        stats.update(X, y)
+        print(f"Folded in {len(y)} listings from {path}.")
+    try:
+        version = publish(stats)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"Published version {version} from {stats.n} listings.")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == 'init':
+        init()
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'add':
+        add(sys.argv[2:])
+    else:
+        sys.exit(__doc__)
@@ -2,6 +2,8 @@ import pandas as pd
 from geopy.geocoders import Nominatim
 import time
 
+import timing
+
 def get_gurgaon_sector_coordinates():
     """
     Scrapes latitude and longitude for Gurgaon sectors 1 to 115.
@@ -27,7 +29,8 @@ def get_gurgaon_sector_coordinates():
             # Adding a small delay to respect the usage policy of Nominatim
             time.sleep(1) 
             
-            location = geolocator.geocode(query)
+            with timing.span('latlong_scrapper.geocode'):
+                location = geolocator.geocode(query)
             
             if location:
                 lat, lon = location.latitude, location.longitude
@@ -54,6 +57,7 @@ def get_gurgaon_sector_coordinates():
             })
 
     print("\nFinished fetching coordinates.")
+    timing.flush()
     
     # Create a pandas DataFrame
     df = pd.DataFrame(sector_data)
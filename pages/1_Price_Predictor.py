@@ -3,6 +3,11 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 
+import comps
+import compute_jobs
+import compute_pool
+import timing
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="Gurgaon Property Price Predictor",
@@ -10,20 +15,70 @@ st.set_page_config(
     layout="wide"
 )
 
+MODEL_PATH = 'data/gurgaon_property_prediction_pipeline.joblib'
+
 # --- Load All Necessary Files ---
 @st.cache_resource
 def load_assets():
-    """Loads all necessary files for the app to function."""
+    """Loads the data needed to draw the input form."""
     try:
-        model = joblib.load('data/gurgaon_property_prediction_pipeline.joblib')
         sector_map = joblib.load('data/sector_map.joblib')
         df = joblib.load('data/X_dataframe.joblib')
-        return model, sector_map, df
+        return sector_map, df
+    except FileNotFoundError:
+        st.error("Necessary data files not found. Please ensure 'sector_map.joblib' and 'X_dataframe.joblib' are in the data folder.")
+        return None, None
+
+@st.cache_resource
+def load_comps_index():
+    """Builds the comparable-listings index once, the first time a prediction is made."""
+    try:
+        return comps.build_comps_index()
     except FileNotFoundError:
-        st.error("Model or necessary data files not found. Please ensure all .joblib files are in the root directory.")
-        return None, None, None
+        st.error("Listing data for comparable properties not found. Please ensure 'X_dataframe.joblib' and 'gurgaon_properties_missing_value_imputation.csv' are in the data folder.")
+        return None
 
-model, sector_map, df = load_assets()
+@st.cache_data
+def load_sector_coordinates():
+    """Loads sector coordinates for the all-sectors valuation map."""
+    try:
+        coords_df = pd.read_csv('data/gurgaon_sectors_lat_long.csv')
+        return coords_df.rename(columns={'sector_name': 'sector', 'log': 'longitude', 'lat': 'latitude'})
+    except FileNotFoundError:
+        st.error("Sector coordinates not found. Please ensure 'gurgaon_sectors_lat_long.csv' is in the data folder.")
+        return None
+
+# Column order of the training data
+FINAL_COLS = ['property_type', 'bedRoom', 'bathroom', 'balcony', 'agePossession',
+              'built_up_area', 'servant room', 'store room', 'furnishing_type',
+              'luxury_category', 'floor_category', 'sector_score',
+              'area_x_sector_score', 'area_x_room', 'bed_bath_ratio']
+
+def add_sector_features(input_df, sectors, sector_map):
+    """
+    Repeats the single-row `input_df` once per sector and engineers the NEW features
+    exactly as in the training script, in the training column order.
+    """
+    batch_df = input_df.loc[input_df.index.repeat(len(sectors))].reset_index(drop=True)
+    batch_df['sector_score'] = [sector_map.get(s, 0) for s in sectors]
+    batch_df['area_x_sector_score'] = batch_df['built_up_area'] * batch_df['sector_score']
+    batch_df['area_x_room'] = batch_df['built_up_area'] / (batch_df['bedRoom'] + 1)
+    batch_df['bed_bath_ratio'] = batch_df['bedRoom'] / (batch_df['bathroom'] + 1)
+    return batch_df[FINAL_COLS]
+
+@st.cache_data(show_spinner=False)
+def value_all_sectors(input_df):
+    """
+    Predicts the price of the configured property in every sector with a single
+    model.predict call. Cached per property configuration.
+    """
+    sectors = sector_map.index.tolist()
+    batch_df = add_sector_features(input_df, sectors, sector_map)
+    predicted_log_prices = compute_pool.run(compute_jobs.predict_log_price, MODEL_PATH, batch_df)
+    return pd.DataFrame({'sector': sectors, 'predicted_price': np.expm1(predicted_log_prices)})
+
+with timing.span('predictor.load_assets'):
+    sector_map, df = load_assets()
 
 # --- Main App UI ---
 st.title("Gurgaon Property Price Predictor")
@@ -55,8 +110,16 @@ if df is not None:
         luxury_category = st.selectbox('Luxury Category', sorted(df['luxury_category'].unique().tolist()))
         floor_category = st.selectbox('Floor Category', sorted(df['floor_category'].unique().tolist()))
 
+    num_comps = st.slider('Comparable listings to show', 1, 20, 5)
+
     # --- Prediction Logic ---
-    if st.button('Predict Price', type="primary"):
+    button_col1, button_col2 = st.columns([1, 4])
+    with button_col1:
+        predict_clicked = st.button('Predict Price', type="primary")
+    with button_col2:
+        compare_clicked = st.button('Compare All Sectors')
+
+    if predict_clicked or compare_clicked:
         # Convert Yes/No to 1/0
         servant_room_num = 1 if servant_room == 'Yes' else 0
         store_room_num = 1 if store_room == 'Yes' else 0
@@ -71,29 +134,95 @@ if df is not None:
         }
         input_df = pd.DataFrame(input_dict)
 
-        # 2. Engineer the NEW features exactly as in the training script
-        input_df['sector_score'] = sector_map.get(sector, 0)
-        input_df['area_x_sector_score'] = input_df['built_up_area'] * input_df['sector_score']
-        input_df['area_x_room'] = input_df['built_up_area'] / (input_df['bedRoom'] + 1)
-        input_df['bed_bath_ratio'] = input_df['bedRoom'] / (input_df['bathroom'] + 1)
-
-        # 3. Ensure column order is the same as the training data
-        final_cols = ['property_type', 'bedRoom', 'bathroom', 'balcony', 'agePossession',
-                      'built_up_area', 'servant room', 'store room', 'furnishing_type',
-                      'luxury_category', 'floor_category', 'sector_score',
-                      'area_x_sector_score', 'area_x_room', 'bed_bath_ratio']
-        
-        input_final_df = input_df[final_cols]
-
-        # 4. Predict
+    if predict_clicked:
+        # 2. Engineer the NEW features for the selected sector, in training column order
+        input_final_df = add_sector_features(input_df, [sector], sector_map)
+
+        # 3. Predict on the compute pool. The pipeline (and with it the whole
+        # scikit-learn/XGBoost stack) is loaded in the worker process, not here.
         try:
-            predicted_log_price = model.predict(input_final_df)
+            with st.spinner("Predicting price..."), timing.span('predictor.model_predict'):
+                predicted_log_price = compute_pool.run(compute_jobs.predict_log_price, MODEL_PATH, input_final_df)
             predicted_price = np.expm1(predicted_log_price)[0]
 
             # Display the result in a more prominent way
             st.subheader("Predicted Price")
             st.markdown(f"<h2 style='text-align: center; color: #28a745;'>₹ {predicted_price:,.2f} Cr.</h2>", unsafe_allow_html=True)
 
+        except FileNotFoundError:
+            st.error("Model file not found. Please ensure 'gurgaon_property_prediction_pipeline.joblib' is in the data folder.")
+        except TimeoutError as e:
+            st.error(f"The prediction took too long. {e}")
         except Exception as e:
             st.error(f"An error occurred during prediction: {e}")
-
+        else:
+            # 4. Show the most similar actual listings next to a successful prediction
+            with timing.span('predictor.load_comps_index'):
+                comps_index = load_comps_index()
+            if comps_index is not None:
+                with timing.span('predictor.comps_query'):
+                    comps_df = comps_index.query(input_df.assign(sector=sector), k=num_comps)
+
+                st.subheader("Comparable Listings")
+                in_sector = int((comps_df['sector'] == sector).sum())
+                st.markdown(f"The {len(comps_df)} listings most similar to this property by rooms, area, furnishing and luxury category, taken from {sector} first.")
+                if in_sector < len(comps_df):
+                    st.caption(f"{sector} has only {in_sector} listed; the rest are the closest matches from other sectors.")
+                st.dataframe(
+                    comps_df[comps.DISPLAY_COLUMNS].rename(columns={'price': 'price (Cr.)'}),
+                    hide_index=True,
+                    use_container_width=True
+                )
+
+    elif compare_clicked:
+        import plotly.express as px
+
+        # Value the same property in every sector with one batched prediction
+        try:
+            with st.spinner("Valuing the property across all sectors..."), timing.span('predictor.value_all_sectors'):
+                valuation_df = value_all_sectors(input_df)
+        except FileNotFoundError:
+            st.error("Model file not found. Please ensure 'gurgaon_property_prediction_pipeline.joblib' is in the data folder.")
+            valuation_df = None
+        except TimeoutError as e:
+            st.error(f"The prediction took too long. {e}")
+            valuation_df = None
+        except Exception as e:
+            st.error(f"An error occurred during prediction: {e}")
+            valuation_df = None
+
+        coords_df = load_sector_coordinates()
+        if valuation_df is not None and coords_df is not None:
+            st.subheader("Estimated Price Across Gurgaon")
+            st.write(
+                "The same property valued in every sector. "
+                "The **color** of each point shows the estimated price in that sector."
+            )
+
+            with timing.span('predictor.figure.valuation_map'):
+                map_df = pd.merge(valuation_df, coords_df, on='sector', how='inner')
+                map_df.dropna(subset=['latitude', 'longitude'], inplace=True)
+                fig_map = px.scatter_mapbox(
+                    map_df,
+                    lat="latitude",
+                    lon="longitude",
+                    color="predicted_price",
+                    color_continuous_scale=px.colors.cyclical.IceFire,
+                    zoom=10,
+                    mapbox_style="open-street-map",
+                    text='sector',
+                    hover_name='sector',
+                    hover_data={'predicted_price': ':.2f', 'latitude': False, 'longitude': False},
+                    labels={'predicted_price': 'Price (Cr.)'}
+                )
+                fig_map.update_traces(marker={'size': 12})
+                fig_map.update_layout(margin={"r": 0, "t": 40, "l": 0, "b": 0})
+            st.plotly_chart(fig_map, use_container_width=True)
+
+            # Sectors without coordinates only appear in the table
+            st.dataframe(
+                valuation_df.sort_values('predicted_price', ascending=False)
+                            .rename(columns={'predicted_price': 'Estimated Price (Cr.)'}),
+                hide_index=True,
+                use_container_width=True
+            )
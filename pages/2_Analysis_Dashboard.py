@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.figure_factory as ff
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 import os
-import ast
+
+import compute_jobs
+import compute_pool
+import timing
+
+# Plotting libraries (plotly, wordcloud, matplotlib) are imported inside the
+# visualization that needs them, so a rerun only loads what the chosen chart uses.
+# The KDE plot and the word cloud are rendered on the compute pool (compute_jobs.py).
 
 # Set the title and layout for the Streamlit page
 st.set_page_config(page_title="Gurgaon Property Analysis", layout="wide")
@@ -38,7 +41,8 @@ def load_data():
         st.info(f"Details: {e}. Please make sure '{PROPERTIES_CSV}', '{COORDINATES_CSV}', and '{PROPERTIES_RAW_CSV}' are in your project's root directory.")
         return None, None, None
 
-props_df, coords_df, wordcloud_base_df = load_data()
+with timing.span('analysis.load_data'):
+    props_df, coords_df, wordcloud_base_df = load_data()
 
 # --- Main App Logic ---
 if all(df is not None for df in [props_df, coords_df, wordcloud_base_df]):
@@ -58,15 +62,16 @@ if all(df is not None for df in [props_df, coords_df, wordcloud_base_df]):
     selected_sector = st.sidebar.selectbox('Select a Sector', sector_list, key='sector_filter')
 
     # --- Main Data Filtering based on sidebar selections ---
-    display_df = props_df.copy()
-    
-    # Apply property type filter
-    if property_type != 'Both':
-        display_df = display_df[display_df['property_type'] == property_type.lower()]
+    with timing.span('analysis.filter'):
+        display_df = props_df.copy()
 
-    # Apply sector filter
-    if selected_sector != 'Overall':
-        display_df = display_df[display_df['sector'] == selected_sector]
+        # Apply property type filter
+        if property_type != 'Both':
+            display_df = display_df[display_df['property_type'] == property_type.lower()]
+
+        # Apply sector filter
+        if selected_sector != 'Overall':
+            display_df = display_df[display_df['sector'] == selected_sector]
 
     # --- Visualization Selector ---
     st.sidebar.header("Select a Visualization")
@@ -85,6 +90,8 @@ if all(df is not None for df in [props_df, coords_df, wordcloud_base_df]):
     # --- Display Selected Visualization ---
 
     if viz_choice == 'Sector Map Analysis':
+        import plotly.express as px
+
         st.header("Sector-wise Property Analysis Map")
         st.write(
             "This interactive map visualizes Gurgaon's real estate market. "
@@ -96,86 +103,97 @@ if all(df is not None for df in [props_df, coords_df, wordcloud_base_df]):
         # However, the property type filter is applied.
         
         # Data processing for the map
-        map_df = props_df.copy()
-        if property_type != 'Both':
-            map_df = map_df[map_df['property_type'] == property_type.lower()]
+        with timing.span('analysis.map_groupby'):
+            map_df = props_df.copy()
+            if property_type != 'Both':
+                map_df = map_df[map_df['property_type'] == property_type.lower()]
 
-        map_df['sector'] = map_df['sector'].str.lower().str.strip()
-        group_df = map_df.groupby('sector').agg({
-            'price_per_sqft': 'mean',
-            'built_up_area': 'mean'
-        }).reset_index()
+            map_df['sector'] = map_df['sector'].str.lower().str.strip()
+            group_df = map_df.groupby('sector').agg({
+                'price_per_sqft': 'mean',
+                'built_up_area': 'mean'
+            }).reset_index()
 
-        coords_df_renamed = coords_df.rename(columns={'sector_name': 'sector', 'log': 'longitude', 'lat': 'latitude'})
-        merged_df = pd.merge(group_df, coords_df_renamed, on='sector', how='inner')
-        merged_df.dropna(subset=['latitude', 'longitude'], inplace=True)
+            coords_df_renamed = coords_df.rename(columns={'sector_name': 'sector', 'log': 'longitude', 'lat': 'latitude'})
+            merged_df = pd.merge(group_df, coords_df_renamed, on='sector', how='inner')
+            merged_df.dropna(subset=['latitude', 'longitude'], inplace=True)
 
         if not merged_df.empty:
-            fig_map = px.scatter_mapbox(
-                merged_df,
-                lat="latitude",
-                lon="longitude",
-                color="price_per_sqft",
-                size='built_up_area',
-                color_continuous_scale=px.colors.cyclical.IceFire,
-                zoom=10,
-                mapbox_style="open-street-map",
-                text='sector',
-                hover_name='sector',
-                hover_data={'price_per_sqft': ':.2f', 'built_up_area': ':.2f'},
-                title=f"Gurgaon Property Analysis for {property_type} Properties"
-            )
-            fig_map.update_layout(
-                margin={"r": 0, "t": 40, "l": 0, "b": 0},
-                title={'x': 0.5, 'xanchor': 'center'}
-            )
+            with timing.span('analysis.figure.sector_map'):
+                fig_map = px.scatter_mapbox(
+                    merged_df,
+                    lat="latitude",
+                    lon="longitude",
+                    color="price_per_sqft",
+                    size='built_up_area',
+                    color_continuous_scale=px.colors.cyclical.IceFire,
+                    zoom=10,
+                    mapbox_style="open-street-map",
+                    text='sector',
+                    hover_name='sector',
+                    hover_data={'price_per_sqft': ':.2f', 'built_up_area': ':.2f'},
+                    title=f"Gurgaon Property Analysis for {property_type} Properties"
+                )
+                fig_map.update_layout(
+                    margin={"r": 0, "t": 40, "l": 0, "b": 0},
+                    title={'x': 0.5, 'xanchor': 'center'}
+                )
             st.plotly_chart(fig_map, use_container_width=True)
         else:
             st.warning("No data to display for the selected filter.")
 
     elif viz_choice == 'Area vs. Price Analysis':
+        import plotly.express as px
+
         st.header("Area vs. Price Scatter Plot")
         st.write(f"Showing relationship between built-up area and price for **{property_type}** properties in **{selected_sector}**.")
         
         if not display_df.empty:
-            fig_scatter = px.scatter(
-                display_df, 
-                x="built_up_area", 
-                y="price", 
-                color="bedRoom", 
-                title=f"Area Vs Price in {selected_sector} for {property_type}"
-            )
+            with timing.span('analysis.figure.area_vs_price'):
+                fig_scatter = px.scatter(
+                    display_df, 
+                    x="built_up_area", 
+                    y="price", 
+                    color="bedRoom", 
+                    title=f"Area Vs Price in {selected_sector} for {property_type}"
+                )
             st.plotly_chart(fig_scatter, use_container_width=True)
         else:
             st.warning("No data available for the selected filters.")
 
     elif viz_choice == 'BHK Price Distribution':
+        import plotly.express as px
+
         st.header("BHK Price Range Box Plot")
         st.write(f"Price distribution by number of bedrooms for **{property_type}** properties in **{selected_sector}**.")
         
         if not display_df.empty:
-            temp_df = display_df[display_df['bedRoom'] <= 4]
-            fig_box = px.box(
-                temp_df, 
-                x='bedRoom', 
-                y='price', 
-                title=f'BHK Price Range in {selected_sector} for {property_type}'
-            )
+            with timing.span('analysis.figure.bhk_box'):
+                temp_df = display_df[display_df['bedRoom'] <= 4]
+                fig_box = px.box(
+                    temp_df, 
+                    x='bedRoom', 
+                    y='price', 
+                    title=f'BHK Price Range in {selected_sector} for {property_type}'
+                )
             st.plotly_chart(fig_box, use_container_width=True)
         else:
             st.warning("No data available for the selected filters.")
 
     elif viz_choice == 'Property Type Distribution':
+        import plotly.express as px
+
         st.header("Property Type and Bedroom Distribution")
         st.write(f"Hierarchical view of properties in **{selected_sector}**.")
 
         if not display_df.empty:
-            fig_sunburst = px.sunburst(
-                display_df.dropna(subset=['bedRoom']),
-                path=['property_type', 'bedRoom'],
-                values='price',
-                title=f"Distribution for {selected_sector}"
-            )
+            with timing.span('analysis.figure.sunburst'):
+                fig_sunburst = px.sunburst(
+                    display_df.dropna(subset=['bedRoom']),
+                    path=['property_type', 'bedRoom'],
+                    values='price',
+                    title=f"Distribution for {selected_sector}"
+                )
             st.plotly_chart(fig_sunburst, use_container_width=True)
         else:
             st.warning("No data available for the selected filters.")
@@ -196,22 +214,35 @@ if all(df is not None for df in [props_df, coords_df, wordcloud_base_df]):
             hist_data = []
             group_labels = []
             if not house_prices.empty:
-                hist_data.append(house_prices)
+                hist_data.append(house_prices.tolist())
                 group_labels.append('House')
             if not flat_prices.empty:
-                hist_data.append(flat_prices)
+                hist_data.append(flat_prices.tolist())
                 group_labels.append('Flat')
 
             if hist_data:
-                fig_dist = ff.create_distplot(hist_data, group_labels, show_hist=False, show_rug=False)
-                fig_dist.update_layout(title_text=f'Price Distribution in {selected_sector}')
-                st.plotly_chart(fig_dist, use_container_width=True)
+                try:
+                    with st.spinner("Building distribution plot..."), timing.span('analysis.figure.distplot'):
+                        fig_dist = compute_pool.run(
+                            compute_jobs.build_distplot,
+                            hist_data,
+                            group_labels,
+                            f'Price Distribution in {selected_sector}'
+                        )
+                    st.plotly_chart(fig_dist, use_container_width=True)
+                except TimeoutError as e:
+                    st.error(f"The distribution plot took too long to build. {e}")
+                except RuntimeError as e:
+                    st.error(f"The distribution plot could not be built. {e}")
             else:
                 st.warning("No data to display for the selected filters.")
         else:
             st.warning("No data available for the selected filters.")
             
     elif viz_choice == 'Common Amenities (Word Cloud)':
+        import ast
+        import matplotlib.pyplot as plt
+
         st.header("Most Common Property Features")
         st.write(f"This word cloud highlights the most frequently mentioned features in property listings for **{selected_sector}**.")
 
@@ -236,15 +267,18 @@ if all(df is not None for df in [props_df, coords_df, wordcloud_base_df]):
             feature_text = ' '.join(features_list)
 
             if feature_text:
-                wordcloud = WordCloud(width=800, height=400,
-                                      background_color='white',
-                                      stopwords=set(['s']),
-                                      min_font_size=10).generate(feature_text)
-
-                fig, ax = plt.subplots(figsize=(10, 5))
-                ax.imshow(wordcloud, interpolation='bilinear')
-                ax.axis("off")
-                st.pyplot(fig)
+                try:
+                    with st.spinner("Generating word cloud..."), timing.span('analysis.wordcloud_generate'):
+                        wordcloud_image = compute_pool.run(compute_jobs.render_wordcloud, feature_text)
+
+                    fig, ax = plt.subplots(figsize=(10, 5))
+                    ax.imshow(wordcloud_image, interpolation='bilinear')
+                    ax.axis("off")
+                    st.pyplot(fig)
+                except TimeoutError as e:
+                    st.error(f"The word cloud took too long to generate. {e}")
+                except RuntimeError as e:
+                    st.error(f"The word cloud could not be generated. {e}")
             else:
                 st.warning(f"No features data available for the selected filters to generate a word cloud.")
         else:
@@ -4,6 +4,8 @@ import numpy as np
 import joblib
 import re
 
+import timing
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="Real Estate Recommender",
@@ -28,7 +30,8 @@ def load_data():
         st.error("Processed data files not found. Please ensure 'df_processed.pkl', 'cosine_sim_facilities.pkl', 'cosine_sim_price.pkl', and 'cosine_sim_location.pkl' are in the same directory as your home.py file.")
         return None, None, None, None
 
-df, cosine_sim_facilities, cosine_sim_price, cosine_sim_location = load_data()
+with timing.span('recommender.load_data'):
+    df, cosine_sim_facilities, cosine_sim_price, cosine_sim_location = load_data()
 
 if df is not None:
     # Create a mapping from property name to its integer index
@@ -97,29 +100,30 @@ if df is not None:
                     if total_weight == 0:
                         st.warning("Please set at least one weight above zero.")
                     else:
-                        # Calculate weighted average score for all properties
-                        final_scores = []
-                        for i in range(len(df)):
-                            weighted_score = (w_facilities * sim_scores_facilities[i][1] + 
-                                              w_price * sim_scores_price[i][1] + 
-                                              w_location * sim_scores_location[i][1]) / total_weight
-                            final_scores.append((i, weighted_score))
-
-                        # Filter scores to only include properties from the location-filtered list
-                        filtered_indices = indices[filtered_df['PropertyName']].tolist()
+                        with timing.span('recommender.score_loop'):
+                            # Calculate weighted average score for all properties
+                            final_scores = []
+                            for i in range(len(df)):
+                                weighted_score = (w_facilities * sim_scores_facilities[i][1] + 
+                                                  w_price * sim_scores_price[i][1] + 
+                                                  w_location * sim_scores_location[i][1]) / total_weight
+                                final_scores.append((i, weighted_score))
+
+                            # Filter scores to only include properties from the location-filtered list
+                            filtered_indices = indices[filtered_df['PropertyName']].tolist()
                         
-                        # Exclude the selected property itself from the recommendations
-                        if idx in filtered_indices:
-                            filtered_indices.remove(idx)
+                            # Exclude the selected property itself from the recommendations
+                            if idx in filtered_indices:
+                                filtered_indices.remove(idx)
 
-                        filtered_final_scores = [(i, score) for i, score in final_scores if i in filtered_indices]
+                            filtered_final_scores = [(i, score) for i, score in final_scores if i in filtered_indices]
 
-                        # Sort the filtered properties based on the final score
-                        sorted_scores = sorted(filtered_final_scores, key=lambda x: x[1], reverse=True)
+                            # Sort the filtered properties based on the final score
+                            sorted_scores = sorted(filtered_final_scores, key=lambda x: x[1], reverse=True)
 
-                        # Get the top 5 recommendations
-                        top_5_recommendations = sorted_scores[:5]
-                        top_indices = [i[0] for i in top_5_recommendations]
+                            # Get the top 5 recommendations
+                            top_5_recommendations = sorted_scores[:5]
+                            top_indices = [i[0] for i in top_5_recommendations]
                         
                         st.success("Here are your top 5 recommendations:")
                         
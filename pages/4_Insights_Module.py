@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 import joblib
 
+import insights_trainer
+import timing
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="Gurgaon Real Estate Insights",
@@ -14,20 +17,34 @@ st.set_page_config(
 @st.cache_resource
 def load_assets():
     """
-    Loads all the final pickle files for the insights module.
+    Loads the insights dataframe used to build the input form.
     Caches the result to prevent reloading on every interaction.
     """
     try:
-        df = joblib.load('data/insights_df_final.pkl') 
-        model = joblib.load('data/ridge_model_final.pkl')
-        scaler = joblib.load('data/scaler_final.pkl')
-        columns = joblib.load('data/model_columns_final.pkl')
-        return df, model, scaler, columns
+        return joblib.load('data/insights_df_final.pkl')
     except FileNotFoundError:
         st.error("One or more required model files are missing. Please run the `train_final_model.py` script first.")
-        return None, None, None, None
+        return None
 
-df, model, scaler, model_columns = load_assets()
+@st.cache_resource(max_entries=2)
+def load_model(version):
+    """
+    Loads the ridge model, scaler and training columns for a published version
+    (see insights_trainer.py), or the notebook's files when `version` is None.
+    Unpickling them imports scikit-learn, so this waits until an estimate is requested.
+    """
+    model_path, scaler_path, columns_path = insights_trainer.artifact_paths(version)
+    try:
+        model = joblib.load(model_path)
+        scaler = joblib.load(scaler_path)
+        columns = joblib.load(columns_path)
+        return model, scaler, columns
+    except FileNotFoundError:
+        st.error("One or more required model files are missing. Please run the `train_final_model.py` script first.")
+        return None, None, None
+
+with timing.span('insights.load_assets'):
+    df = load_assets()
 
 # --- UI Layout ---
 st.title("💡 Real Estate Price Insights ")
@@ -67,7 +84,13 @@ if df is not None:
 
     # --- Prediction Logic ---
     if st.button("Estimate Price", type="primary"):
-        
+        # Checking the latest version on every estimate picks up newly published models
+        # without restarting the app; each version is only loaded once.
+        with timing.span('insights.load_model'):
+            model, scaler, model_columns = load_model(insights_trainer.latest_version())
+        if model is None:
+            st.stop()
+
         # 1. Create a dictionary with the basic user inputs
         input_data = {
             'property_type': property_type,
@@ -97,11 +120,12 @@ if df is not None:
         final_input_df = pd.concat([final_input_df, input_df], ignore_index=True, sort=False).fillna(0)
         final_input_df = final_input_df[model_columns]
 
-        # 6. Scale the features
-        scaled_input = scaler.transform(final_input_df)
+        with timing.span('insights.model_predict'):
+            # 6. Scale the features
+            scaled_input = scaler.transform(final_input_df)
 
-        # 7. Make the prediction
-        prediction_log = model.predict(scaled_input)
+            # 7. Make the prediction
+            prediction_log = model.predict(scaled_input)
 
         # 8. Inverse transform to get the actual price
         predicted_price = np.expm1(prediction_log)[0]
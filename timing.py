@@ -0,0 +1,205 @@
+"""
+Lightweight span timing for the Streamlit pages and batch scripts.
+
+Timing is off unless the GURGAON_TIMING environment variable is set to 1.
+When on, every `span()` records its wall-clock duration into a per-span
+histogram. A background thread writes the histograms to a Prometheus text file
+every few seconds while there is something new, and once more when the process exits.
+
+Each process writes its own file, `timing.<role>.<pid>.prom` in GURGAON_TIMING_DIR
+(default `metrics`), so the Streamlit server and batch scripts don't overwrite each
+other. The role is the running script's name; `read_metrics()` merges all files.
+When a process starts timing, it removes the files of earlier runs of the same script
+whose process has exited, so each script keeps at most one finished run's file
+alongside those of its live processes.
+"""
+import atexit
+import glob
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+ENABLED = os.environ.get('GURGAON_TIMING', '0') == '1'
+METRICS_DIR = os.environ.get('GURGAON_TIMING_DIR', 'metrics')
+ROLE = re.sub(r'\W', '', os.path.splitext(os.path.basename(sys.argv[0] if sys.argv else ''))[0]) or 'python'
+METRICS_FILE = os.path.join(METRICS_DIR, f'timing.{ROLE}.{os.getpid()}.prom')
+FLUSH_INTERVAL = 5.0
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_NAME = 'gurgaon_span_seconds'
+
+_lock = threading.Lock()
+_spans = {}  # span name -> {'buckets': [...], 'sum': float, 'count': int}
+_dirty = threading.Event()
+
+
+@contextmanager
+def span(name):
+    """Times the enclosed block under `name`. Does nothing when timing is off."""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def record(name, seconds):
+    """Adds one observation to the histogram for `name`."""
+    with _lock:
+        hist = _spans.get(name)
+        if hist is None:
+            hist = {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+            _spans[name] = hist
+        hist['buckets'][bisect_left(BUCKETS, seconds)] += 1
+        hist['sum'] += seconds
+        hist['count'] += 1
+    _dirty.set()
+
+
+def flush():
+    """Writes this process's current histograms to its metrics file straight away."""
+    if not ENABLED:
+        return
+    with _lock:
+        _dirty.clear()
+        text = _render()
+    _write(text)
+
+
+def _flush_periodically():
+    while True:
+        _dirty.wait()
+        time.sleep(FLUSH_INTERVAL)
+        flush()
+
+
+def _is_running(pid):
+    if os.name == 'nt':
+        # os.kill() would terminate the process on Windows, so ask for its exit code instead
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED: exists but not ours
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+        return exit_code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _remove_stale_files():
+    """Deletes the metrics files of earlier runs of this script whose process has exited."""
+    for path in glob.glob(os.path.join(METRICS_DIR, f'timing.{ROLE}.*.prom')):
+        pid = path.rsplit('.', 2)[-2]
+        if not pid.isdigit() or int(pid) == os.getpid() or _is_running(int(pid)):
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+if ENABLED:
+    _remove_stale_files()
+    threading.Thread(target=_flush_periodically, name='timing-flush', daemon=True).start()
+    atexit.register(flush)
+
+
+def _render():
+    lines = [
+        f'# HELP {METRIC_NAME} Wall-clock time spent in instrumented spans.',
+        f'# TYPE {METRIC_NAME} histogram',
+    ]
+    for name in sorted(_spans):
+        hist = _spans[name]
+        label = name.replace('\\', '\\\\').replace('"', '\\"')
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), hist['buckets']):
+            cumulative += count
+            lines.append(f'{METRIC_NAME}_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {hist["sum"]:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {hist["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _write(text):
+    # Write to a temporary file first so readers never see a half-written file
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    tmp_path = f'{METRICS_FILE}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, METRICS_FILE)
+
+
+# --- Reading the metrics files back ---
+_SAMPLE_RE = re.compile(r'^(\w+)\{span="((?:[^"\\]|\\.)*)"(?:,le="([^"]+)")?\} (\S+)$')
+
+
+def read_metrics(directory=METRICS_DIR):
+    """
+    Parses and merges every metrics file written by this module into `directory`.
+
+    Returns:
+        dict: span name -> {'buckets': [(upper_bound, cumulative_count), ...], 'sum': float, 'count': int}
+    """
+    merged = {}
+    for path in sorted(glob.glob(os.path.join(directory, 'timing.*.prom'))):
+        try:
+            spans = _read_file(path)
+        except FileNotFoundError:
+            continue
+        for name, hist in spans.items():
+            total = merged.setdefault(name, {'buckets': {}, 'sum': 0.0, 'count': 0})
+            for bound, cumulative in hist['buckets']:
+                total['buckets'][bound] = total['buckets'].get(bound, 0) + cumulative
+            total['sum'] += hist['sum']
+            total['count'] += hist['count']
+    for hist in merged.values():
+        hist['buckets'] = sorted(hist['buckets'].items())
+    return merged
+
+
+def _read_file(path):
+    spans = {}
+    with open(path) as f:
+        for line in f:
+            match = _SAMPLE_RE.match(line.strip())
+            if not match:
+                continue
+            metric, label, bound, value = match.groups()
+            name = label.replace('\\"', '"').replace('\\\\', '\\')
+            hist = spans.setdefault(name, {'buckets': [], 'sum': 0.0, 'count': 0})
+            if metric == f'{METRIC_NAME}_bucket':
+                hist['buckets'].append((float(bound), int(value)))
+            elif metric == f'{METRIC_NAME}_sum':
+                hist['sum'] = float(value)
+            elif metric == f'{METRIC_NAME}_count':
+                hist['count'] = int(value)
+    return spans
+
+
+def quantile(hist, q):
+    """Estimates the q-th quantile of a histogram as the upper bound of the bucket it falls in."""
+    if hist['count'] == 0:
+        return 0.0
+    target = q * hist['count']
+    for bound, cumulative in hist['buckets']:
+        if cumulative >= target:
+            return bound
+    return float('inf')